@@ -8,15 +8,25 @@ Extracts musical features from audio files:
 - Structural segments
 """
 
+import hashlib
 import json
+import logging
+import os
+import tempfile
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Optional
 
 import numpy as np
 
+try:
+    import orjson  # Optional: faster JSON serialization
+except ImportError:
+    orjson = None
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class MusicalFeatures:
     """Extracted musical features from audio."""
     # Basic info
@@ -55,14 +65,21 @@ class MusicalFeatures:
 
     def to_json(self, path: str | Path) -> None:
         """Save to JSON file."""
-        with open(path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        if orjson is not None:
+            # orjson serializes dataclasses natively, skipping asdict()'s deep copy
+            Path(path).write_bytes(orjson.dumps(self, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w") as f:
+                json.dump(self.to_dict(), f, indent=2)
 
     @classmethod
     def from_json(cls, path: str | Path) -> "MusicalFeatures":
         """Load from JSON file."""
-        with open(path) as f:
-            data = json.load(f)
+        if orjson is not None:
+            data = orjson.loads(Path(path).read_bytes())
+        else:
+            with open(path) as f:
+                data = json.load(f)
         return cls(**data)
 
 
@@ -147,6 +164,35 @@ def analyze_audio(
 
     # Load audio
     y, sr = librosa.load(str(file_path), sr=sr)
+
+    return analyze_signal(y, sr, hop_length=hop_length, n_mfcc=n_mfcc)
+
+
+def analyze_signal(
+    y: np.ndarray,
+    sr: int,
+    hop_length: int = 512,
+    n_mfcc: int = 13
+) -> MusicalFeatures:
+    """
+    Extract musical features from an already decoded mono signal.
+
+    Args:
+        y: Mono audio samples as floats in [-1, 1]
+        sr: Sample rate of y
+        hop_length: Hop length for feature extraction
+        n_mfcc: Number of MFCC coefficients
+
+    Returns:
+        MusicalFeatures object with extracted features
+    """
+    try:
+        import librosa
+    except ImportError:
+        raise ImportError(
+            "librosa is required. Install with: pip install librosa"
+        )
+
     duration = librosa.get_duration(y=y, sr=sr)
 
     # Tempo and beats
@@ -216,6 +262,67 @@ def analyze_audio(
     )
 
 
+def _file_digest(file_path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-1 of a file's contents, read in chunks."""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def analyze_audio_cached(
+    file_path: str | Path,
+    cache_dir: str | Path,
+    sr: int = 22050,
+    hop_length: int = 512,
+    n_mfcc: int = 13
+) -> MusicalFeatures:
+    """
+    Analyze an audio file, reusing features cached by file content.
+
+    Features are stored as JSON in cache_dir, keyed by the SHA-1 of the
+    audio data plus the analysis settings, so re-analyzing the same audio
+    skips librosa entirely.
+
+    Args:
+        file_path: Path to audio file (WAV, MP3, etc.)
+        cache_dir: Directory holding cached feature files
+        sr: Sample rate to use
+        hop_length: Hop length for feature extraction
+        n_mfcc: Number of MFCC coefficients
+
+    Returns:
+        MusicalFeatures object with extracted features
+    """
+    cache_dir = Path(cache_dir)
+    cache_path = cache_dir / f"{_file_digest(file_path)}_{sr}_{hop_length}_{n_mfcc}.json"
+
+    if cache_path.exists():
+        try:
+            return MusicalFeatures.from_json(cache_path)
+        except (OSError, ValueError, TypeError):
+            pass  # Unreadable entry, recompute and overwrite it
+
+    features = analyze_audio(file_path, sr=sr, hop_length=hop_length, n_mfcc=n_mfcc)
+
+    # Write to a temp file and rename so concurrent readers never see a partial
+    # entry. Caching is best-effort: an unwritable cache must not cost the result.
+    tmp_path = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        os.close(fd)
+        features.to_json(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("Could not cache features in %s: %s", cache_dir, e)
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+
+    return features
+
+
 def analyze_for_generation(features: MusicalFeatures) -> dict:
     """
     Extract key parameters for music generation from analyzed features.
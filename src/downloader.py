@@ -8,11 +8,24 @@ import os
 import subprocess
 import tempfile
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+if TYPE_CHECKING:
+    import numpy as np
 
-@dataclass
+
+# Audio file types yt-dlp may leave behind in a download directory
+AUDIO_EXTENSIONS = frozenset({".wav", ".mp3", ".m4a", ".webm", ".opus"})
+
+# Invariant parts of the yt-dlp/ffmpeg command lines, built once
+_YT_DLP_QUIET_ARGS = ("--no-playlist", "--no-warnings", "--quiet")
+_YT_DLP_STREAM_ARGS = ("yt-dlp", "--format", "bestaudio", "--output", "-", *_YT_DLP_QUIET_ARGS)
+_FFMPEG_PCM_ARGS = ("ffmpeg", "-v", "error", "-i", "pipe:0", "-f", "s16le", "-ac", "1")
+
+
+@dataclass(slots=True)
 class DownloadResult:
     """Result of a download operation."""
     success: bool
@@ -21,8 +34,9 @@ class DownloadResult:
     duration_seconds: Optional[float] = None
 
 
-def check_yt_dlp_installed() -> bool:
-    """Check if yt-dlp is installed and accessible."""
+@lru_cache(maxsize=None)
+def _probe_yt_dlp() -> bool:
+    """Run `yt-dlp --version`; a timeout propagates so it is not cached."""
     try:
         result = subprocess.run(
             ["yt-dlp", "--version"],
@@ -31,7 +45,21 @@ def check_yt_dlp_installed() -> bool:
             timeout=10
         )
         return result.returncode == 0
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    except FileNotFoundError:
+        return False
+
+
+def check_yt_dlp_installed() -> bool:
+    """
+    Check if yt-dlp is installed and accessible.
+
+    A definite answer is cached for the life of the process, since every
+    download would otherwise spawn a `yt-dlp --version` subprocess first.
+    A probe that times out (e.g. a slow first start) is retried next time.
+    """
+    try:
+        return _probe_yt_dlp()
+    except subprocess.TimeoutExpired:
         return False
 
 
@@ -81,9 +109,11 @@ def download_audio(
         "--audio-format", output_format,
         "--audio-quality", "0",  # Best quality
         "--output", output_template,
-        "--no-playlist",
-        "--no-warnings",
-        "--quiet",
+        *_YT_DLP_QUIET_ARGS,
+        # Report the final file and its duration, saving a directory scan
+        # and an ffprobe run afterwards
+        "--print", "after_move:filepath",
+        "--print", "after_move:duration",
     ]
 
     # Add duration limit if specified
@@ -111,20 +141,24 @@ def download_audio(
             error_msg = result.stderr.strip() if result.stderr else "Unknown download error"
             return DownloadResult(success=False, error=error_msg)
 
-        # Find the downloaded file
-        output_path = Path(output_dir)
-        files = list(output_path.glob(f"*.{output_format}"))
-
-        if not files:
-            return DownloadResult(
-                success=False,
-                error="Download completed but no output file found"
-            )
-
-        downloaded_file = files[0]
-
-        # Get duration using ffprobe if available
-        duration = get_audio_duration(str(downloaded_file))
+        printed = result.stdout.splitlines()
+        if printed and Path(printed[0]).is_file():
+            downloaded_file = Path(printed[0])
+        else:
+            # Older yt-dlp without after_move printing: find the file instead
+            files = list(Path(output_dir).glob(f"*.{output_format}"))
+            if not files:
+                return DownloadResult(
+                    success=False,
+                    error="Download completed but no output file found"
+                )
+            downloaded_file = files[0]
+
+        try:
+            duration = float(printed[1])
+        except (IndexError, ValueError):
+            # Get duration using ffprobe if available
+            duration = get_audio_duration(str(downloaded_file))
 
         return DownloadResult(
             success=True,
@@ -138,6 +172,104 @@ def download_audio(
         return DownloadResult(success=False, error=str(e))
 
 
+@dataclass(slots=True)
+class StreamResult:
+    """Result of streaming decoded audio into memory."""
+    success: bool
+    samples: Optional["np.ndarray"] = None
+    sample_rate: Optional[int] = None
+    error: Optional[str] = None
+
+
+def stream_audio(
+    url: str,
+    max_duration_seconds: int = 600,
+    sample_rate: int = 22050
+) -> StreamResult:
+    """
+    Stream audio from a YouTube video straight into memory.
+
+    yt-dlp writes the best audio stream to stdout, which is piped through
+    ffmpeg to decode it to mono 16-bit PCM. Nothing touches the disk.
+
+    Args:
+        url: YouTube video URL or video ID
+        max_duration_seconds: Maximum duration to download (default: 10 minutes)
+        sample_rate: Sample rate to decode to
+
+    Returns:
+        StreamResult with float32 mono samples in [-1, 1] or error message
+    """
+    if not check_yt_dlp_installed():
+        return StreamResult(
+            success=False,
+            error="yt-dlp is not installed. Install with: pip install yt-dlp"
+        )
+
+    # Normalize URL
+    if not url.startswith("http"):
+        url = f"https://www.youtube.com/watch?v={url}"
+
+    download_cmd = list(_YT_DLP_STREAM_ARGS)
+    if max_duration_seconds > 0:
+        download_cmd.extend(["--match-filter", f"duration<={max_duration_seconds}"])
+    download_cmd.append(url)
+
+    decode_cmd = [*_FFMPEG_PCM_ARGS, "-ar", str(sample_rate), "pipe:1"]
+
+    import numpy as np
+
+    downloader = None
+    decoder = None
+    # yt-dlp's stderr goes to a file: a pipe nobody reads until ffmpeg is
+    # done could fill up and stall the download
+    download_log = tempfile.TemporaryFile()
+    try:
+        downloader = subprocess.Popen(
+            download_cmd,
+            stdout=subprocess.PIPE,
+            stderr=download_log
+        )
+        decoder = subprocess.Popen(
+            decode_cmd,
+            stdin=downloader.stdout,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        # Only ffmpeg should hold the read end, so yt-dlp sees EPIPE if it exits
+        downloader.stdout.close()
+
+        pcm, decode_err = decoder.communicate(timeout=300)  # 5 minute timeout
+        downloader.wait(timeout=30)
+
+        if downloader.returncode != 0:
+            download_log.seek(0)
+            error_msg = download_log.read().decode(errors="replace").strip()
+            return StreamResult(success=False, error=error_msg or "Unknown download error")
+        if decoder.returncode != 0:
+            error_msg = decode_err.decode(errors="replace").strip()
+            return StreamResult(success=False, error=error_msg or "Unknown decode error")
+        if not pcm:
+            return StreamResult(
+                success=False,
+                error="Stream completed but no audio was received"
+            )
+
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        return StreamResult(success=True, samples=samples, sample_rate=sample_rate)
+
+    except subprocess.TimeoutExpired:
+        return StreamResult(success=False, error="Download timed out")
+    except Exception as e:
+        return StreamResult(success=False, error=str(e))
+    finally:
+        for proc in (decoder, downloader):
+            if proc is not None and proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        download_log.close()
+
+
 def get_audio_duration(file_path: str) -> Optional[float]:
     """Get audio duration using ffprobe."""
     try:
@@ -197,18 +329,22 @@ def cleanup_downloads(directory: str | Path) -> int:
     Returns:
         Number of files removed
     """
-    directory = Path(directory)
-    if not directory.exists():
-        return 0
-
     count = 0
-    for ext in ["wav", "mp3", "m4a", "webm", "opus"]:
-        for file in directory.glob(f"*.{ext}"):
-            try:
-                file.unlink()
-                count += 1
-            except OSError:
-                pass
+    try:
+        # Single directory pass; DirEntry type checks avoid a stat per file
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if os.path.splitext(entry.name)[1] not in AUDIO_EXTENSIONS:
+                    continue
+                try:
+                    os.unlink(entry.path)
+                    count += 1
+                except OSError:
+                    pass
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
     return count
 
 
@@ -5,14 +5,21 @@ Generates procedural relaxation music based on analyzed features.
 Uses midiutil to create MIDI files.
 """
 
+import io
+import os
 import random
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 
+# Lookup tables are read-only (mapping proxies over tuples) so callers can't
+# mutate shared state.
+
 # MIDI note numbers for C4 (middle C) to C5
-NOTE_MAP = {
+NOTE_MAP = MappingProxyType({
     "C": 60, "C#": 61, "Db": 61,
     "D": 62, "D#": 63, "Eb": 63,
     "E": 64,
@@ -20,45 +27,62 @@ NOTE_MAP = {
     "G": 67, "G#": 68, "Ab": 68,
     "A": 69, "A#": 70, "Bb": 70,
     "B": 71
-}
+})
 
 # Scale intervals (semitones from root)
-SCALES = {
-    "major": [0, 2, 4, 5, 7, 9, 11],
-    "minor": [0, 2, 3, 5, 7, 8, 10],
-    "pentatonic_major": [0, 2, 4, 7, 9],
-    "pentatonic_minor": [0, 3, 5, 7, 10],
-    "dorian": [0, 2, 3, 5, 7, 9, 10],
-}
+SCALES = MappingProxyType({
+    "major": (0, 2, 4, 5, 7, 9, 11),
+    "minor": (0, 2, 3, 5, 7, 8, 10),
+    "pentatonic_major": (0, 2, 4, 7, 9),
+    "pentatonic_minor": (0, 3, 5, 7, 10),
+    "dorian": (0, 2, 3, 5, 7, 9, 10),
+})
 
 # Chord patterns (intervals from root)
-CHORDS = {
-    "major": [0, 4, 7],
-    "minor": [0, 3, 7],
-    "major7": [0, 4, 7, 11],
-    "minor7": [0, 3, 7, 10],
-    "sus2": [0, 2, 7],
-    "sus4": [0, 5, 7],
-}
+CHORDS = MappingProxyType({
+    "major": (0, 4, 7),
+    "minor": (0, 3, 7),
+    "major7": (0, 4, 7, 11),
+    "minor7": (0, 3, 7, 10),
+    "sus2": (0, 2, 7),
+    "sus4": (0, 5, 7),
+})
+
+# Velocity range for sustained chords (soft for relaxation)
+CHORD_VELOCITIES = range(40, 61)
+
+# Beats within a measure where the bass plays (beats 1 and 3)
+BASS_BEATS = (0, 2)
+
+# Beats within a measure where melody notes may start
+MELODY_BEATS = (0, 1, 2, 3)
+
+# Melody pitch offsets (semitones) and note lengths (beats)
+MELODY_PITCH_SHIFTS = (-2, -1, 1, 2)
+MELODY_DURATIONS = (0.5, 1.0, 1.5, 2.0)
+
+# Total seconds of music below which rendering in-process beats starting
+# worker processes (a 120 s piece renders in about 2 ms)
+PARALLEL_RENDER_MIN_SECONDS = 3600
 
 # Common relaxation chord progressions (Roman numerals as scale degrees)
-PROGRESSIONS = {
-    "major": [
-        [1, 4, 5, 1],      # I - IV - V - I
-        [1, 6, 4, 5],      # I - vi - IV - V
-        [1, 5, 6, 4],      # I - V - vi - IV
-        [1, 4, 1, 5],      # I - IV - I - V
-    ],
-    "minor": [
-        [1, 4, 5, 1],      # i - iv - v - i
-        [1, 6, 3, 7],      # i - VI - III - VII
-        [1, 7, 6, 5],      # i - VII - VI - v
-        [1, 4, 6, 5],      # i - iv - VI - v
-    ]
-}
-
-
-@dataclass
+PROGRESSIONS = MappingProxyType({
+    "major": (
+        (1, 4, 5, 1),      # I - IV - V - I
+        (1, 6, 4, 5),      # I - vi - IV - V
+        (1, 5, 6, 4),      # I - V - vi - IV
+        (1, 4, 1, 5),      # I - IV - I - V
+    ),
+    "minor": (
+        (1, 4, 5, 1),      # i - iv - v - i
+        (1, 6, 3, 7),      # i - VI - III - VII
+        (1, 7, 6, 5),      # i - VII - VI - v
+        (1, 4, 6, 5),      # i - iv - VI - v
+    )
+})
+
+
+@dataclass(slots=True)
 class GenerationParams:
     """Parameters for music generation."""
     tempo: int = 60
@@ -88,21 +112,19 @@ def get_chord_notes(root_midi: int, chord_type: str) -> list[int]:
     return [root_midi + interval for interval in intervals]
 
 
-def generate_relaxation_midi(
+def generate_relaxation_midi_bytes(
     params: GenerationParams,
-    output_path: str | Path,
     seed: Optional[int] = None
-) -> str:
+) -> bytes:
     """
-    Generate a relaxation music MIDI file.
+    Generate relaxation music as an in-memory MIDI file.
 
     Args:
         params: Generation parameters
-        output_path: Path to save the MIDI file
-        seed: Random seed for reproducibility
+        seed: Random seed for reproducibility (uses a private generator)
 
     Returns:
-        Path to the generated MIDI file
+        Contents of the generated MIDI file
     """
     try:
         from midiutil import MIDIFile
@@ -111,8 +133,9 @@ def generate_relaxation_midi(
             "midiutil is required. Install with: pip install midiutil"
         )
 
-    if seed is not None:
-        random.seed(seed)
+    # A seeded render draws from its own generator, leaving the caller's
+    # global random state alone
+    rng = random.Random(seed) if seed is not None else random
 
     # Create MIDI file with 3 tracks
     midi = MIDIFile(3, deinterleave=False)
@@ -130,40 +153,61 @@ def generate_relaxation_midi(
     total_beats = int(params.duration_seconds * params.tempo / 60)
     total_measures = total_beats // beats_per_measure
 
-    # Get scale notes
+    # Get scale notes once; the other registers are whole-octave shifts of it
     scale = get_scale_notes(params.root_note, params.mode, params.melody_octave)
-    bass_scale = get_scale_notes(params.root_note, params.mode, params.bass_octave)
-    chord_scale = get_scale_notes(params.root_note, params.mode, params.chord_octave)
+    bass_shift = (params.bass_octave - params.melody_octave) * 12
+    chord_shift = (params.chord_octave - params.melody_octave) * 12
+    bass_scale = [note + bass_shift for note in scale]
+    chord_scale = [note + chord_shift for note in scale]
 
     # Choose chord progression
     progression_options = PROGRESSIONS.get(params.mode, PROGRESSIONS["major"])
-    progression = random.choice(progression_options)
+    progression = rng.choice(progression_options)
+
+    # Resolve each progression step once: (chord root, chord type, bass note).
+    # Degrees I, IV and V take the mode's own quality, the rest the opposite.
+    if params.mode == "minor":
+        primary_type, secondary_type = "minor", "major"
+    else:
+        primary_type, secondary_type = "major", "minor"
+    progression_chords = []
+    for degree in progression:
+        chord_degree = degree - 1  # Convert to 0-indexed
+        progression_chords.append((
+            chord_scale[chord_degree % len(chord_scale)],
+            primary_type if chord_degree in (0, 3, 4) else secondary_type,
+            bass_scale[chord_degree % len(bass_scale)],
+        ))
+
+    # Loop-invariant lookups, hoisted out of the per-measure/per-note loops
+    add_note = midi.addNote
+    variation_amount = params.variation_amount
+    add_chords = params.add_chords
+    add_bass = params.add_bass
+    add_melody = params.add_melody
+    num_chords = len(progression_chords)
 
     # Generate music
     current_beat = 0
 
     for measure in range(total_measures):
         # Get chord for this measure
-        chord_degree = progression[measure % len(progression)] - 1  # Convert to 0-indexed
-        chord_root = chord_scale[chord_degree % len(chord_scale)]
-
-        # Determine chord type based on mode and degree
-        if params.mode == "minor":
-            chord_type = "minor" if chord_degree in [0, 3, 4] else "major"
-        else:
-            chord_type = "major" if chord_degree in [0, 3, 4] else "minor"
+        chord_root, chord_type, bass_note = progression_chords[measure % num_chords]
 
         # Add variation
-        if random.random() < params.variation_amount:
-            chord_type = random.choice(["sus2", "sus4", chord_type])
+        if rng.random() < variation_amount:
+            chord_type = rng.choice(("sus2", "sus4", chord_type))
+
+        # Melody also draws on the chord tones, so resolve them either way
+        chord_notes = get_chord_notes(chord_root, chord_type)
 
         # Generate chords
-        if params.add_chords:
-            chord_notes = get_chord_notes(chord_root, chord_type)
-            for note in chord_notes:
+        if add_chords:
+            # Soft velocities for relaxation, drawn for the whole chord at once
+            velocities = rng.choices(CHORD_VELOCITIES, k=len(chord_notes))
+            for note, velocity in zip(chord_notes, velocities):
                 # Play chord for whole measure
-                velocity = random.randint(40, 60)  # Soft for relaxation
-                midi.addNote(
+                add_note(
                     track_chords,
                     0,  # channel
                     note,
@@ -173,14 +217,13 @@ def generate_relaxation_midi(
                 )
 
         # Generate bass
-        if params.add_bass:
-            bass_note = bass_scale[chord_degree % len(bass_scale)]
+        if add_bass:
             # Bass plays on beats 1 and 3
-            for beat_offset in [0, 2]:
+            for beat_offset in BASS_BEATS:
                 if current_beat + beat_offset < total_beats:
-                    velocity = random.randint(50, 70)
-                    duration = 1.5 if random.random() < 0.3 else 1.0
-                    midi.addNote(
+                    velocity = rng.randint(50, 70)
+                    duration = 1.5 if rng.random() < 0.3 else 1.0
+                    add_note(
                         track_bass,
                         0,
                         bass_note,
@@ -190,33 +233,29 @@ def generate_relaxation_midi(
                     )
 
         # Generate melody
-        if params.add_melody:
+        if add_melody:
             # Relaxation melody: sparse, gentle notes from scale
-            melody_beats = [0, 1, 2, 3]
-            random.shuffle(melody_beats)
-            # Only play on 1-2 beats per measure for sparse feel
-            num_notes = random.randint(1, 2)
-
-            for i in range(num_notes):
-                beat_in_measure = melody_beats[i]
+            # Only play on 1-2 distinct beats per measure for sparse feel
+            num_notes = rng.randint(1, 2)
 
+            for beat_in_measure in rng.sample(MELODY_BEATS, num_notes):
                 # Choose note from scale, prefer chord tones
-                if random.random() < 0.6:
+                if rng.random() < 0.6:
                     # Use chord tone
-                    note = chord_notes[random.randint(0, len(chord_notes) - 1)]
+                    note = chord_notes[rng.randint(0, len(chord_notes) - 1)]
                     note = note + 12  # Move to melody octave
                 else:
                     # Use scale tone
-                    note = random.choice(scale)
+                    note = rng.choice(scale)
 
                 # Add variation to pitch
-                if random.random() < params.variation_amount:
-                    note += random.choice([-2, -1, 1, 2])
+                if rng.random() < variation_amount:
+                    note += rng.choice(MELODY_PITCH_SHIFTS)
 
-                velocity = random.randint(45, 65)
-                duration = random.choice([0.5, 1.0, 1.5, 2.0])
+                velocity = rng.randint(45, 65)
+                duration = rng.choice(MELODY_DURATIONS)
 
-                midi.addNote(
+                add_note(
                     track_melody,
                     0,
                     note,
@@ -227,33 +266,53 @@ def generate_relaxation_midi(
 
         current_beat += beats_per_measure
 
-    # Save MIDI file
+    # Serialize in memory; midiutil issues many small writes per track
+    buffer = io.BytesIO()
+    midi.writeFile(buffer)
+    return buffer.getvalue()
+
+
+def generate_relaxation_midi(
+    params: GenerationParams,
+    output_path: str | Path,
+    seed: Optional[int] = None
+) -> str:
+    """
+    Generate a relaxation music MIDI file.
+
+    Args:
+        params: Generation parameters
+        output_path: Path to save the MIDI file
+        seed: Random seed for reproducibility
+
+    Returns:
+        Path to the generated MIDI file
+    """
+    data = generate_relaxation_midi_bytes(params, seed=seed)
+
+    # Save MIDI file in a single write
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(output_path, "wb") as f:
-        midi.writeFile(f)
+    output_path.write_bytes(data)
 
     return str(output_path)
 
 
-def generate_from_analysis(
+def _params_from_analysis(
     analysis_params: dict,
-    output_path: str | Path,
     variation: float = 0.3,
     duration_override: Optional[int] = None
-) -> str:
+) -> GenerationParams:
     """
-    Generate MIDI based on analysis parameters from analyzer module.
+    Build generation parameters from analyzer.analyze_for_generation() output.
 
     Args:
         analysis_params: Dict from analyzer.analyze_for_generation()
-        output_path: Path to save MIDI file
         variation: How much to vary (0-1)
         duration_override: Override duration in seconds
 
     Returns:
-        Path to generated MIDI file
+        GenerationParams for the analyzed piece
     """
     params = GenerationParams(
         tempo=analysis_params.get("tempo", 60),
@@ -267,21 +326,76 @@ def generate_from_analysis(
     if analysis_params.get("is_calm", True):
         params.tempo = min(params.tempo, 80)  # Keep tempo calm
 
-    return generate_relaxation_midi(params, output_path)
+    return params
+
+
+def generate_from_analysis_bytes(
+    analysis_params: dict,
+    variation: float = 0.3,
+    duration_override: Optional[int] = None,
+    seed: Optional[int] = None
+) -> bytes:
+    """
+    Generate an in-memory MIDI file based on analysis parameters.
+
+    Args:
+        analysis_params: Dict from analyzer.analyze_for_generation()
+        variation: How much to vary (0-1)
+        duration_override: Override duration in seconds
+        seed: Random seed for reproducibility
+
+    Returns:
+        Contents of the generated MIDI file
+    """
+    params = _params_from_analysis(analysis_params, variation, duration_override)
+    return generate_relaxation_midi_bytes(params, seed=seed)
+
+
+def generate_from_analysis(
+    analysis_params: dict,
+    output_path: str | Path,
+    variation: float = 0.3,
+    duration_override: Optional[int] = None,
+    seed: Optional[int] = None
+) -> str:
+    """
+    Generate MIDI based on analysis parameters from analyzer module.
+
+    Args:
+        analysis_params: Dict from analyzer.analyze_for_generation()
+        output_path: Path to save MIDI file
+        variation: How much to vary (0-1)
+        duration_override: Override duration in seconds
+        seed: Random seed for reproducibility
+
+    Returns:
+        Path to generated MIDI file
+    """
+    params = _params_from_analysis(analysis_params, variation, duration_override)
+    return generate_relaxation_midi(params, output_path, seed=seed)
 
 
 def generate_variations(
     base_params: GenerationParams,
     output_dir: str | Path,
-    num_variations: int = 3
+    num_variations: int = 3,
+    max_workers: Optional[int] = None
 ) -> list[str]:
     """
     Generate multiple variations of a piece.
 
+    Variations are rendered in-process unless max_workers asks for worker
+    processes, or the batch is long enough (PARALLEL_RENDER_MIN_SECONDS of
+    music in total) to be worth starting them. Each variation is seeded by
+    its index through a private generator, so the files are the same either
+    way and the caller's random state is not reseeded.
+
     Args:
         base_params: Base generation parameters
         output_dir: Directory to save files
         num_variations: Number of variations to generate
+        max_workers: Worker processes to use (default: pool only for large
+            batches, 1 = in-process)
 
     Returns:
         List of paths to generated MIDI files
@@ -289,22 +403,32 @@ def generate_variations(
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    paths = []
+    jobs = []
     for i in range(num_variations):
-        # Vary parameters slightly
-        varied_params = GenerationParams(
+        # Vary parameters slightly; replace() keeps every other field of the
+        # caller's params (track toggles, octaves, time signature) intact
+        varied_params = replace(
+            base_params,
             tempo=base_params.tempo + random.randint(-5, 5),
-            root_note=base_params.root_note,
-            mode=base_params.mode,
-            duration_seconds=base_params.duration_seconds,
             variation_amount=base_params.variation_amount + random.uniform(-0.1, 0.1),
         )
-
-        output_path = output_dir / f"variation_{i + 1}.mid"
-        generate_relaxation_midi(varied_params, output_path, seed=i)
-        paths.append(str(output_path))
-
-    return paths
+        jobs.append((varied_params, output_dir / f"variation_{i + 1}.mid", i))
+
+    if max_workers is None and num_variations * base_params.duration_seconds >= PARALLEL_RENDER_MIN_SECONDS:
+        max_workers = min(num_variations, os.cpu_count() or 1)
+
+    if max_workers is None or max_workers <= 1 or len(jobs) <= 1:
+        return [
+            generate_relaxation_midi(params, output_path, seed=seed)
+            for params, output_path, seed in jobs
+        ]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(generate_relaxation_midi, params, output_path, seed=seed)
+            for params, output_path, seed in jobs
+        ]
+        return [future.result() for future in futures]
 
 
 if __name__ == "__main__":
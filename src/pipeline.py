@@ -9,28 +9,75 @@ Orchestrates the complete flow:
 """
 
 import argparse
+import importlib
 import json
 import logging
+import os
+import random
+import shutil
 import tempfile
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+try:
+    import orjson  # Optional: faster JSON serialization
+except ImportError:
+    orjson = None
 
 from .youtube_search import search_relaxation_music, VideoResult
-from .downloader import download_audio, cleanup_downloads, DownloadResult
-from .analyzer import analyze_audio, analyze_for_generation, MusicalFeatures
-from .generator import generate_from_analysis, generate_relaxation_midi, GenerationParams
+
+# The downloader, analyzer and generator pull in numpy/librosa/midiutil, so
+# they are imported where used; the names stay importable from here on demand.
+_LAZY_EXPORTS = {
+    "download_audio": ".downloader",
+    "stream_audio": ".downloader",
+    "cleanup_downloads": ".downloader",
+    "analyze_audio": ".analyzer",
+    "analyze_audio_cached": ".analyzer",
+    "analyze_signal": ".analyzer",
+    "analyze_for_generation": ".analyzer",
+    "generate_from_analysis": ".generator",
+    "generate_from_analysis_bytes": ".generator",
+    "generate_relaxation_midi": ".generator",
+    "generate_relaxation_midi_bytes": ".generator",
+    "GenerationParams": ".generator",
+}
+
+
+def __getattr__(name: str):
+    """Resolve lazily imported re-exports (PEP 562)."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __package__), name)
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent yt-dlp downloads per pipeline run
+MAX_DOWNLOAD_WORKERS = 4
+
+# Longest video yt-dlp will fetch; longer ones are rejected before download
+MAX_DOWNLOAD_SECONDS = 600
+
+# Where analyzed audio features are cached between runs
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "music_pipeline"
+
+
+def _dumps_json(data) -> bytes:
+    """Serialize data as indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
 
-@dataclass
+@dataclass(slots=True)
 class PipelineResult:
     """Result of a complete pipeline run."""
     success: bool
@@ -40,6 +87,7 @@ class PipelineResult:
     generated_files: list[str]
     errors: list[str]
     timestamp: str
+    elapsed_seconds: Optional[float] = None
 
     def to_dict(self) -> dict:
         return {
@@ -52,12 +100,259 @@ class PipelineResult:
             "analyses": self.analyses,
             "generated_files": self.generated_files,
             "errors": self.errors,
-            "timestamp": self.timestamp
+            "timestamp": self.timestamp,
+            "elapsed_seconds": self.elapsed_seconds
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to indented JSON bytes."""
+        return _dumps_json(self.to_dict())
+
     def save(self, path: str | Path) -> None:
-        with open(path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        """
+        Save the result as JSON.
+
+        When there are analyses, they are also written to a sibling
+        analysis_summary.json.
+        """
+        path = Path(path)
+        path.write_bytes(self.to_json_bytes())
+        if self.analyses:
+            summary_path = path.with_name("analysis_summary.json")
+            summary_path.write_bytes(_dumps_json(self.analyses))
+            logger.info("Saved analysis summary: %s", summary_path)
+
+
+@dataclass(slots=True)
+class _VideoOutcome:
+    """Download and analysis outputs for a single search result."""
+    downloaded_file: Optional[str] = None
+    analysis: Optional[dict] = None
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _GenerationJob:
+    """One MIDI file to render: func(*args, **kwargs) returns its bytes."""
+    func: Callable[..., bytes]
+    args: tuple
+    kwargs: dict
+    output_path: str
+    label: str = ""
+
+
+def _process_video(
+    index: int,
+    video: VideoResult,
+    total: int,
+    download_dir: Optional[Path],
+    cache_dir: Optional[Path],
+    keep_download: bool = True
+) -> _VideoOutcome:
+    """
+    Download and analyze one search result.
+
+    With download_dir=None the audio is streamed and decoded in memory
+    instead of being written to disk. Unless keep_download is set, the
+    downloaded file is deleted as soon as it has been analyzed, so disk use
+    stays bounded by the number of downloads in flight.
+    """
+    from .downloader import download_audio, stream_audio
+    from .analyzer import analyze_audio, analyze_audio_cached, analyze_signal, analyze_for_generation
+
+    outcome = _VideoOutcome()
+    logger.info("Processing %d/%d: %s", index + 1, total, video.title)
+
+    try:
+        if download_dir is None:
+            result = stream_audio(url=video.url, max_duration_seconds=MAX_DOWNLOAD_SECONDS)
+            if not result.success:
+                outcome.errors.append(f"Download failed for {video.title}: {result.error}")
+                logger.error("Download failed: %s", result.error)
+                return outcome
+            logger.info("Streamed: %s", video.title)
+        else:
+            result = download_audio(
+                url=video.url,
+                output_dir=download_dir,
+                max_duration_seconds=MAX_DOWNLOAD_SECONDS
+            )
+
+            if not (result.success and result.file_path):
+                outcome.errors.append(f"Download failed for {video.title}: {result.error}")
+                logger.error("Download failed: %s", result.error)
+                return outcome
+
+            outcome.downloaded_file = result.file_path
+            logger.info("Downloaded: %s", result.file_path)
+
+        # Analyze
+        try:
+            if download_dir is None:
+                features = analyze_signal(result.samples, result.sample_rate)
+            elif cache_dir is not None:
+                features = analyze_audio_cached(result.file_path, cache_dir)
+            else:
+                features = analyze_audio(result.file_path)
+            gen_params = analyze_for_generation(features)
+            gen_params["source_video"] = video.title
+            outcome.analysis = gen_params
+            logger.info(
+                "Analyzed: tempo=%s, key=%s %s",
+                gen_params["tempo"], gen_params["root_note"], gen_params["mode"]
+            )
+        except Exception as e:
+            outcome.errors.append(f"Analysis failed for {video.title}: {str(e)}")
+            logger.error("Analysis error: %s", e)
+            return outcome
+        finally:
+            if outcome.downloaded_file and not keep_download:
+                Path(outcome.downloaded_file).unlink(missing_ok=True)
+
+    except Exception as e:
+        outcome.errors.append(f"Processing failed for {video.title}: {str(e)}")
+        logger.error("Processing error: %s", e)
+
+    return outcome
+
+
+@lru_cache(maxsize=None)
+def _warm_up_analyzer() -> None:
+    """
+    Run the analyzer once on a short synthetic signal.
+
+    librosa compiles its numba kernels on first use, which otherwise delays
+    the first real analysis by a few seconds. Cached, so it runs at most once
+    per process.
+    """
+    try:
+        import numpy as np
+        from .analyzer import analyze_signal
+
+        sr = 22050
+        noise = np.random.default_rng(0).standard_normal(sr).astype(np.float32) * 0.01
+        analyze_signal(noise, sr)
+    except Exception as e:
+        # Best effort: real analyses will surface any genuine problem
+        logger.debug("Analyzer warm-up skipped: %s", e)
+
+
+def _run_generation_job(job: _GenerationJob) -> tuple[Optional[bytes], Optional[str]]:
+    """Run one generation job, returning (midi_bytes, error)."""
+    try:
+        return job.func(*job.args, **job.kwargs), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _generation_workers(
+    num_jobs: int,
+    duration_seconds: int,
+    max_workers: Optional[int] = None
+) -> int:
+    """
+    Number of worker processes to render num_jobs files with (0 = in-process).
+
+    Renders take milliseconds, so a pool is only used when the caller asks
+    for one or the total music is long enough to outweigh starting it.
+    """
+    from .generator import PARALLEL_RENDER_MIN_SECONDS
+
+    if max_workers is None:
+        if num_jobs * duration_seconds < PARALLEL_RENDER_MIN_SECONDS:
+            return 0
+        max_workers = os.cpu_count() or 1
+    workers = min(max_workers, num_jobs)
+    return workers if workers > 1 else 0
+
+
+def _start_generation_job(
+    executor: Optional[ProcessPoolExecutor],
+    job: _GenerationJob
+) -> Future:
+    """Submit a job to the pool, or run it here when there is no usable pool."""
+    if executor is not None:
+        try:
+            return executor.submit(_run_generation_job, job)
+        except Exception as e:
+            # BrokenProcessPool once a worker has died
+            result = None, str(e)
+    else:
+        result = _run_generation_job(job)
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def _start_generation_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """
+    Start a generation pool with its workers already running (None if workers is 0).
+
+    With the fork start method every worker is forked on the first submit, so
+    priming the pool here keeps the fork ahead of the download threads;
+    forking a multi-threaded process can deadlock.
+    """
+    if not workers:
+        return None
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        executor.submit(int).result()
+    except Exception as e:
+        executor.shutdown()
+        logger.warning("Generation pool unavailable, rendering in-process: %s", e)
+        return None
+    return executor
+
+
+def _generation_result(future: Future) -> tuple[Optional[bytes], Optional[str]]:
+    """(midi_bytes, error) of a generation job, including worker crashes."""
+    try:
+        return future.result()
+    except Exception as e:
+        return None, str(e)
+
+
+def _run_generation_jobs(
+    jobs: list[_GenerationJob],
+    generated_files: list[str],
+    errors: list[str],
+    workers: int = 0
+) -> None:
+    """
+    Run MIDI generation jobs, in worker processes when workers > 0.
+
+    Workers only render MIDI bytes; files are written here. Generated paths
+    and errors (including crashed workers) are appended in job order.
+    """
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [_start_generation_job(executor, job) for job in jobs]
+            results = [_generation_result(future) for future in futures]
+    else:
+        results = [_run_generation_job(job) for job in jobs]
+
+    _record_generation_results(jobs, results, generated_files, errors)
+
+
+def _record_generation_results(
+    jobs: list[_GenerationJob],
+    results: list[tuple[Optional[bytes], Optional[str]]],
+    generated_files: list[str],
+    errors: list[str]
+) -> None:
+    """Write rendered MIDI files and record paths and errors in job order."""
+    for (data, error), job in zip(results, jobs):
+        if error is None:
+            try:
+                Path(job.output_path).write_bytes(data)
+            except OSError as e:
+                error = str(e)
+        if error is None:
+            generated_files.append(job.output_path)
+            logger.info("Generated: %s", job.output_path)
+        else:
+            errors.append(f"Generation failed{job.label}: {error}")
+            logger.error("Generation error: %s", error)
 
 
 def run_pipeline(
@@ -68,7 +363,10 @@ def run_pipeline(
     generate_variations: int = 1,
     variation_amount: float = 0.3,
     duration_seconds: int = 120,
-    cleanup_after: bool = True
+    cleanup_after: bool = True,
+    cache_dir: Optional[str | Path] = DEFAULT_CACHE_DIR,
+    stream_mode: bool = False,
+    generation_workers: Optional[int] = None
 ) -> PipelineResult:
     """
     Run the complete relaxation music generation pipeline.
@@ -82,10 +380,26 @@ def run_pipeline(
         variation_amount: How much to vary from source (0-1)
         duration_seconds: Duration of generated music
         cleanup_after: Whether to delete downloaded audio files after
+        cache_dir: Directory for cached audio features (None disables caching)
+        stream_mode: Decode audio in memory instead of downloading files
+            (bypasses the feature cache)
+        generation_workers: Worker processes for MIDI rendering (default: pool
+            only for long batches, 1 = in-process)
 
     Returns:
         PipelineResult with all outputs and errors
     """
+    from .generator import (
+        generate_from_analysis_bytes,
+        generate_relaxation_midi,
+        generate_relaxation_midi_bytes,
+        GenerationParams,
+    )
+
+    # One timestamp for the run, taken when it starts
+    timestamp = datetime.now().isoformat()
+    start = time.perf_counter()
+
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -94,20 +408,23 @@ def run_pipeline(
     downloaded_files = []
     analyses = []
     generated_files = []
+    generation_jobs = []
 
     # Step 1: Search YouTube
-    logger.info(f"Searching YouTube for: {search_query}")
+    logger.info("Searching YouTube for: %s", search_query)
     try:
         search_results = search_relaxation_music(
             query=search_query,
             limit=limit,
             min_duration_minutes=3,
-            max_duration_minutes=15
+            # When downloading, drop videos the downloader would refuse here,
+            # from metadata, so they don't take up slots in the limit
+            max_duration_minutes=MAX_DOWNLOAD_SECONDS // 60 if download_audio_files else 15
         )
-        logger.info(f"Found {len(search_results)} videos")
+        logger.info("Found %d videos", len(search_results))
     except Exception as e:
         errors.append(f"Search failed: {str(e)}")
-        logger.error(f"Search failed: {e}")
+        logger.error("Search failed: %s", e)
 
     if not search_results:
         # Generate with default parameters if no search results
@@ -123,7 +440,7 @@ def run_pipeline(
         try:
             generate_relaxation_midi(params, output_path)
             generated_files.append(str(output_path))
-            logger.info(f"Generated default: {output_path}")
+            logger.info("Generated default: %s", output_path)
         except Exception as e:
             errors.append(f"Generation failed: {str(e)}")
 
@@ -134,97 +451,123 @@ def run_pipeline(
             analyses=analyses,
             generated_files=generated_files,
             errors=errors,
-            timestamp=datetime.now().isoformat()
+            timestamp=timestamp,
+            elapsed_seconds=time.perf_counter() - start
         )
 
-    # Step 2: Download and analyze audio
+    # Output paths for every (source, variation), built once as strings
+    output_paths = [
+        [str(output_dir / f"generated_{i + 1}_v{j + 1}.mid") for j in range(generate_variations)]
+        for i in range(len(search_results))
+    ]
+
+    # Step 2: Download and analyze audio, generating from each analysis as it lands
     if download_audio_files:
-        download_dir = tempfile.mkdtemp(prefix="music_download_")
+        download_dir = None if stream_mode else Path(tempfile.mkdtemp(prefix="music_download_"))
 
-        for i, video in enumerate(search_results):
-            logger.info(f"Processing {i + 1}/{len(search_results)}: {video.title}")
+        outcomes = [None] * len(search_results)
+        video_jobs = [[] for _ in search_results]
+        video_results = [[] for _ in search_results]
 
-            # Download
-            try:
-                result = download_audio(
-                    url=video.url,
-                    output_dir=download_dir,
-                    max_duration_seconds=600
+        # Downloads are network-bound, so videos are processed concurrently.
+        # Each gets its own subdirectory so yt-dlp outputs never get mixed up.
+        # A video's variations are handed to generation as soon as its
+        # analysis is done, overlapping with the remaining downloads.
+        max_workers = min(len(search_results), MAX_DOWNLOAD_WORKERS)
+        gen_executor = _start_generation_pool(_generation_workers(
+            len(search_results) * generate_variations, duration_seconds, generation_workers
+        ))
+
+        # Compile librosa's kernels while the first downloads run; started
+        # after the generation pool so its workers are forked thread-free
+        threading.Thread(target=_warm_up_analyzer, daemon=True).start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        _process_video,
+                        index=i,
+                        video=video,
+                        total=len(search_results),
+                        download_dir=download_dir / f"video_{i + 1}" if download_dir else None,
+                        cache_dir=Path(cache_dir) if cache_dir is not None else None,
+                        keep_download=not cleanup_after
+                    ): i
+                    for i, video in enumerate(search_results)
+                }
+
+                for future in as_completed(futures):
+                    i = futures[future]
+                    outcome = outcomes[i] = future.result()
+                    if not outcome.analysis:
+                        continue
+
+                    # Each variation gets its own seed so worker processes (which
+                    # inherit identical random state) still produce distinct music
+                    for output_path in output_paths[i]:
+                        video_jobs[i].append(_GenerationJob(
+                            func=generate_from_analysis_bytes,
+                            args=(outcome.analysis,),
+                            kwargs={
+                                "variation": variation_amount,
+                                "duration_override": duration_seconds,
+                                "seed": random.randrange(2**32),
+                            },
+                            output_path=output_path,
+                            label=f" for {search_results[i].title}",
+                        ))
+                    video_results[i] = [
+                        _start_generation_job(gen_executor, job) for job in video_jobs[i]
+                    ]
+
+            # Merge in search order so results line up with search_results
+            for outcome, jobs, results in zip(outcomes, video_jobs, video_results):
+                if outcome.downloaded_file:
+                    downloaded_files.append(outcome.downloaded_file)
+                errors.extend(outcome.errors)
+                if outcome.analysis:
+                    analyses.append(outcome.analysis)
+                _record_generation_results(
+                    jobs, [_generation_result(f) for f in results], generated_files, errors
                 )
+        finally:
+            if gen_executor is not None:
+                gen_executor.shutdown()
 
-                if result.success and result.file_path:
-                    downloaded_files.append(result.file_path)
-                    logger.info(f"Downloaded: {result.file_path}")
-
-                    # Analyze
-                    try:
-                        features = analyze_audio(result.file_path)
-                        gen_params = analyze_for_generation(features)
-                        gen_params["source_video"] = video.title
-                        analyses.append(gen_params)
-                        logger.info(f"Analyzed: tempo={gen_params['tempo']}, key={gen_params['root_note']} {gen_params['mode']}")
-
-                        # Generate variations
-                        for j in range(generate_variations):
-                            output_name = f"generated_{i + 1}_v{j + 1}.mid"
-                            output_path = output_dir / output_name
-                            try:
-                                generate_from_analysis(
-                                    gen_params,
-                                    output_path,
-                                    variation=variation_amount,
-                                    duration_override=duration_seconds
-                                )
-                                generated_files.append(str(output_path))
-                                logger.info(f"Generated: {output_path}")
-                            except Exception as e:
-                                errors.append(f"Generation failed for {video.title}: {str(e)}")
-                                logger.error(f"Generation error: {e}")
-
-                    except Exception as e:
-                        errors.append(f"Analysis failed for {video.title}: {str(e)}")
-                        logger.error(f"Analysis error: {e}")
-                else:
-                    errors.append(f"Download failed for {video.title}: {result.error}")
-                    logger.error(f"Download failed: {result.error}")
-
-            except Exception as e:
-                errors.append(f"Processing failed for {video.title}: {str(e)}")
-                logger.error(f"Processing error: {e}")
-
-        # Cleanup downloads if requested
-        if cleanup_after:
-            cleanup_downloads(download_dir)
-            logger.info("Cleaned up downloaded files")
+            # Audio files were removed as each video finished; drop the temp
+            # tree too, including anything yt-dlp left behind
+            if cleanup_after and download_dir is not None:
+                shutil.rmtree(download_dir, ignore_errors=True)
+                logger.info("Cleaned up downloaded files")
 
     else:
-        # Generate without analysis using metadata hints
-        for i, video in enumerate(search_results):
-            # Use default calm parameters
-            params = GenerationParams(
-                tempo=65,
-                root_note="C",
-                mode="major",
-                duration_seconds=duration_seconds,
-                variation_amount=variation_amount
-            )
+        # Generate without analysis using default calm parameters,
+        # shared by every search result
+        params = GenerationParams(
+            tempo=65,
+            root_note="C",
+            mode="major",
+            duration_seconds=duration_seconds,
+            variation_amount=variation_amount
+        )
 
-            for j in range(generate_variations):
-                output_name = f"generated_{i + 1}_v{j + 1}.mid"
-                output_path = output_dir / output_name
-                try:
-                    generate_relaxation_midi(params, output_path, seed=i * 100 + j)
-                    generated_files.append(str(output_path))
-                    logger.info(f"Generated: {output_path}")
-                except Exception as e:
-                    errors.append(f"Generation failed: {str(e)}")
-
-    # Save analysis summary
-    if analyses:
-        summary_path = output_dir / "analysis_summary.json"
-        with open(summary_path, "w") as f:
-            json.dump(analyses, f, indent=2)
-        logger.info(f"Saved analysis summary: {summary_path}")
+        for i, video_paths in enumerate(output_paths):
+            for j, output_path in enumerate(video_paths):
+                generation_jobs.append(_GenerationJob(
+                    func=generate_relaxation_midi_bytes,
+                    args=(params,),
+                    kwargs={"seed": i * 100 + j},
+                    output_path=output_path,
+                ))
+
+        # Step 3: Generate all variations
+        _run_generation_jobs(
+            generation_jobs,
+            generated_files,
+            errors,
+            workers=_generation_workers(len(generation_jobs), duration_seconds, generation_workers)
+        )
 
     return PipelineResult(
         success=len(generated_files) > 0,
@@ -233,10 +576,54 @@ def run_pipeline(
         analyses=analyses,
         generated_files=generated_files,
         errors=errors,
-        timestamp=datetime.now().isoformat()
+        timestamp=timestamp,
+        elapsed_seconds=time.perf_counter() - start
     )
 
 
+def _run_batch_entry(kwargs: dict) -> PipelineResult:
+    """Run one pipeline from keyword arguments (picklable worker target)."""
+    return run_pipeline(**kwargs)
+
+
+def run_batch(
+    configs: list[dict],
+    output_dir: str | Path = "output",
+    max_workers: Optional[int] = None
+) -> list[PipelineResult]:
+    """
+    Run several independent pipelines in parallel worker processes.
+
+    Each config is a dict of run_pipeline keyword arguments. Configs without
+    their own "output_dir" are given "<output_dir>/run_<n>" so that runs never
+    overwrite each other's generated_*.mid files. The runs already occupy the
+    worker processes, so each renders its MIDI in-process unless its config
+    sets "generation_workers".
+
+    Args:
+        configs: List of run_pipeline keyword-argument dicts
+        output_dir: Base directory for configs that don't set one
+        max_workers: Worker processes to use (default: CPU count)
+
+    Returns:
+        List of PipelineResult objects, in the same order as configs
+    """
+    output_dir = Path(output_dir)
+    jobs = [
+        {"output_dir": output_dir / f"run_{k + 1}", "generation_workers": 1, **config}
+        for k, config in enumerate(configs)
+    ]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_run_batch_entry, jobs))
+
+
+def _log_level(name: str) -> Optional[int]:
+    """Map a level name such as "debug" to its logging constant, or None if unknown."""
+    level = logging.getLevelName(name.upper())
+    return level if isinstance(level, int) else None
+
+
 def main():
     """CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -286,9 +673,30 @@ def main():
         action="store_true",
         help="Keep downloaded audio files"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Don't reuse or store analyzed features (cache: {DEFAULT_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Analyze audio in memory without saving downloads to disk"
+    )
 
     args = parser.parse_args()
 
+    # Configured here rather than at import so library users keep control
+    # of logging; LOG_LEVEL=WARNING silences per-video progress
+    level_name = os.environ.get("LOG_LEVEL", "INFO")
+    level = _log_level(level_name)
+    logging.basicConfig(
+        level=logging.INFO if level is None else level,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    if level is None:
+        logger.warning("Unknown LOG_LEVEL %r, using INFO", level_name)
+
     result = run_pipeline(
         search_query=args.search,
         limit=args.limit,
@@ -297,7 +705,9 @@ def main():
         generate_variations=args.variations,
         variation_amount=args.variation_amount,
         duration_seconds=args.duration,
-        cleanup_after=not args.keep_downloads
+        cleanup_after=not args.keep_downloads,
+        cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR,
+        stream_mode=args.stream
     )
 
     # Print summary
@@ -309,6 +719,7 @@ def main():
     print(f"Files downloaded: {len(result.downloaded_files)}")
     print(f"Files analyzed: {len(result.analyses)}")
     print(f"MIDI files generated: {len(result.generated_files)}")
+    print(f"Elapsed: {result.elapsed_seconds:.1f}s")
 
     if result.generated_files:
         print("\nGenerated files:")
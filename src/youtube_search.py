@@ -4,11 +4,23 @@ YouTube search module for finding relaxation music.
 Uses youtube-search-python to search without API key.
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+# Default search queries for get_top_relaxation_videos
+DEFAULT_CATEGORIES = (
+    "relaxation music",
+    "meditation music",
+    "sleep music",
+    "calm piano music",
+    "ambient relaxing music",
+    "nature sounds relaxation",
+)
+
+
+@dataclass(slots=True)
 class VideoResult:
     """Represents a YouTube video search result."""
     video_id: str
@@ -132,28 +144,21 @@ def search_relaxation_music(
 
 
 def get_top_relaxation_videos(
-    categories: list[str] | None = None,
+    categories: Sequence[str] | None = None,
     limit_per_category: int = 5
 ) -> list[VideoResult]:
     """
     Get top relaxation videos across multiple categories.
 
     Args:
-        categories: List of search queries. Defaults to common relaxation music types.
+        categories: Search queries. Defaults to common relaxation music types.
         limit_per_category: Number of videos per category
 
     Returns:
         List of unique VideoResult objects sorted by view count
     """
     if categories is None:
-        categories = [
-            "relaxation music",
-            "meditation music",
-            "sleep music",
-            "calm piano music",
-            "ambient relaxing music",
-            "nature sounds relaxation"
-        ]
+        categories = DEFAULT_CATEGORIES
 
     all_results = []
     seen_ids = set()
@@ -8,6 +8,7 @@ from src.analyzer import (
     MusicalFeatures,
     estimate_key,
     analyze_audio,
+    analyze_audio_cached,
     analyze_for_generation,
     KEY_NAMES,
 )
@@ -92,6 +93,107 @@ class TestMusicalFeatures:
         assert loaded.tempo == original.tempo
         assert loaded.estimated_key == original.estimated_key
 
+    def test_json_roundtrip_without_orjson(self, tmp_path, mocker):
+        """Falls back to the stdlib json module when orjson is missing."""
+        mocker.patch("src.analyzer.orjson", None)
+        original = MusicalFeatures(
+            duration_seconds=30.0,
+            sample_rate=22050,
+            tempo=60.0,
+            beat_times=[0.0, 1.0],
+            estimated_key="F major",
+            key_confidence=0.6,
+            chroma_mean=[0.2] * 12,
+            mfcc_mean=[0.0] * 13,
+            mfcc_std=[1.0] * 13,
+            spectral_centroid_mean=900.0,
+            spectral_bandwidth_mean=1400.0,
+            spectral_rolloff_mean=2200.0,
+            rms_mean=0.05,
+            rms_std=0.01,
+            segment_boundaries=[],
+            num_segments=1
+        )
+
+        json_path = tmp_path / "features.json"
+        original.to_json(json_path)
+
+        assert MusicalFeatures.from_json(json_path) == original
+
+
+class TestAnalyzeAudioCached:
+    """Tests for analyze_audio_cached function."""
+
+    @pytest.fixture
+    def features(self):
+        return MusicalFeatures(
+            duration_seconds=45.0,
+            sample_rate=22050,
+            tempo=68.0,
+            beat_times=[0.0, 0.88],
+            estimated_key="E minor",
+            key_confidence=0.7,
+            chroma_mean=[0.1] * 12,
+            mfcc_mean=[0.0] * 13,
+            mfcc_std=[1.0] * 13,
+            spectral_centroid_mean=1100.0,
+            spectral_bandwidth_mean=1600.0,
+            spectral_rolloff_mean=2600.0,
+            rms_mean=0.09,
+            rms_std=0.02,
+            segment_boundaries=[20.0],
+            num_segments=2
+        )
+
+    def test_reuses_features_for_same_content(self, tmp_path, mocker, features):
+        analyze = mocker.patch("src.analyzer.analyze_audio", return_value=features)
+        first = tmp_path / "first.wav"
+        second = tmp_path / "second.wav"
+        first.write_bytes(b"RIFF" * 100)
+        second.write_bytes(b"RIFF" * 100)
+        cache_dir = tmp_path / "cache"
+
+        assert analyze_audio_cached(first, cache_dir) == features
+        assert analyze_audio_cached(second, cache_dir) == features
+        assert analyze.call_count == 1
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+    def test_different_content_or_settings_miss(self, tmp_path, mocker, features):
+        analyze = mocker.patch("src.analyzer.analyze_audio", return_value=features)
+        first = tmp_path / "first.wav"
+        second = tmp_path / "second.wav"
+        first.write_bytes(b"RIFF" * 100)
+        second.write_bytes(b"RIFX" * 100)
+        cache_dir = tmp_path / "cache"
+
+        analyze_audio_cached(first, cache_dir)
+        analyze_audio_cached(second, cache_dir)
+        analyze_audio_cached(first, cache_dir, sr=44100)
+
+        assert analyze.call_count == 3
+
+    def test_corrupt_entry_is_recomputed(self, tmp_path, mocker, features):
+        analyze = mocker.patch("src.analyzer.analyze_audio", return_value=features)
+        audio = tmp_path / "audio.wav"
+        audio.write_bytes(b"RIFF" * 100)
+        cache_dir = tmp_path / "cache"
+
+        analyze_audio_cached(audio, cache_dir)
+        for entry in cache_dir.glob("*.json"):
+            entry.write_text("{not json")
+
+        assert analyze_audio_cached(audio, cache_dir) == features
+        assert analyze.call_count == 2
+
+    def test_unwritable_cache_still_returns_features(self, tmp_path, mocker, features):
+        mocker.patch("src.analyzer.analyze_audio", return_value=features)
+        audio = tmp_path / "audio.wav"
+        audio.write_bytes(b"RIFF" * 100)
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_bytes(b"")
+
+        assert analyze_audio_cached(audio, blocker / "cache") == features
+
 
 class TestEstimateKey:
     """Tests for key estimation function."""
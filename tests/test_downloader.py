@@ -1,11 +1,19 @@
 """Tests for audio downloader module."""
 
+import subprocess
+import sys
+
+import numpy as np
 import pytest
 from pathlib import Path
 from src.downloader import (
+    _probe_yt_dlp,
     check_yt_dlp_installed,
     download_audio,
+    stream_audio,
+    cleanup_downloads,
     DownloadResult,
+    StreamResult,
 )
 
 
@@ -17,6 +25,37 @@ class TestCheckYtDlpInstalled:
         result = check_yt_dlp_installed()
         assert isinstance(result, bool)
 
+    def test_probes_once(self, mocker):
+        run = mocker.patch(
+            "src.downloader.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="2024.01.01")
+        )
+        _probe_yt_dlp.cache_clear()
+        try:
+            assert check_yt_dlp_installed() is True
+            assert check_yt_dlp_installed() is True
+        finally:
+            _probe_yt_dlp.cache_clear()
+
+        run.assert_called_once()
+
+    def test_timeout_not_cached(self, mocker):
+        run = mocker.patch(
+            "src.downloader.subprocess.run",
+            side_effect=[
+                subprocess.TimeoutExpired(["yt-dlp"], 10),
+                subprocess.CompletedProcess([], 0, stdout="2024.01.01"),
+            ]
+        )
+        _probe_yt_dlp.cache_clear()
+        try:
+            assert check_yt_dlp_installed() is False
+            assert check_yt_dlp_installed() is True
+        finally:
+            _probe_yt_dlp.cache_clear()
+
+        assert run.call_count == 2
+
 
 class TestDownloadResult:
     """Tests for DownloadResult dataclass."""
@@ -73,3 +112,163 @@ class TestDownloadAudio:
         assert isinstance(result, DownloadResult)
         assert result.success is False
         assert "yt-dlp" in result.error.lower()
+
+
+class TestDownloadAudioOutput:
+    """Tests for how download_audio locates its output."""
+
+    @pytest.fixture(autouse=True)
+    def yt_dlp_available(self, mocker):
+        mocker.patch("src.downloader.check_yt_dlp_installed", return_value=True)
+
+    def test_uses_printed_path_and_duration(self, tmp_path, mocker):
+        audio = tmp_path / "abc.wav"
+        audio.write_bytes(b"RIFF")
+        mocker.patch(
+            "src.downloader.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout=f"{audio}\n245.5\n", stderr="")
+        )
+        probe = mocker.patch("src.downloader.get_audio_duration")
+
+        result = download_audio("abc", output_dir=tmp_path)
+
+        assert result.success is True
+        assert result.file_path == str(audio)
+        assert result.duration_seconds == 245.5
+        probe.assert_not_called()
+
+    def test_falls_back_to_scan_and_probe(self, tmp_path, mocker):
+        audio = tmp_path / "abc.wav"
+        audio.write_bytes(b"RIFF")
+        mocker.patch(
+            "src.downloader.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="", stderr="")
+        )
+        mocker.patch("src.downloader.get_audio_duration", return_value=12.0)
+
+        result = download_audio("abc", output_dir=tmp_path)
+
+        assert result.file_path == str(audio)
+        assert result.duration_seconds == 12.0
+
+    def test_missing_output(self, tmp_path, mocker):
+        mocker.patch(
+            "src.downloader.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="", stderr="")
+        )
+
+        result = download_audio("abc", output_dir=tmp_path)
+
+        assert result.success is False
+        assert "no output file" in result.error
+
+
+class TestStreamAudio:
+    """Tests for stream_audio function."""
+
+    def test_requires_yt_dlp(self, mocker):
+        mocker.patch("src.downloader.check_yt_dlp_installed", return_value=False)
+
+        result = stream_audio("https://youtube.com/watch?v=test")
+
+        assert isinstance(result, StreamResult)
+        assert result.success is False
+        assert "yt-dlp" in result.error.lower()
+
+    def test_decodes_piped_pcm(self, mocker):
+        """PCM from the yt-dlp | ffmpeg pipe is converted to float samples."""
+        mocker.patch("src.downloader.check_yt_dlp_installed", return_value=True)
+        real_popen = subprocess.Popen
+
+        def fake_popen(cmd, **kwargs):
+            if cmd[0] == "yt-dlp":
+                # Four little-endian int16 samples of 0x4000 (half scale)
+                cmd = [sys.executable, "-c", "import sys; sys.stdout.buffer.write(b'\\x00\\x40' * 4)"]
+            else:
+                cmd = ["cat"]
+            return real_popen(cmd, **kwargs)
+
+        mocker.patch("src.downloader.subprocess.Popen", side_effect=fake_popen)
+
+        result = stream_audio("test", sample_rate=16000)
+
+        assert result.success is True
+        assert result.sample_rate == 16000
+        assert result.samples.dtype == np.float32
+        np.testing.assert_allclose(result.samples, [0.5] * 4)
+
+    def test_command_lines(self, mocker):
+        mocker.patch("src.downloader.check_yt_dlp_installed", return_value=True)
+        popen = mocker.patch("src.downloader.subprocess.Popen", side_effect=OSError("stop"))
+
+        stream_audio("abc", max_duration_seconds=120, sample_rate=16000)
+
+        download_cmd = popen.call_args.args[0]
+        assert download_cmd[:5] == ["yt-dlp", "--format", "bestaudio", "--output", "-"]
+        assert download_cmd[-3:] == [
+            "--match-filter", "duration<=120", "https://www.youtube.com/watch?v=abc"
+        ]
+
+    def test_empty_stream_fails(self, mocker):
+        mocker.patch("src.downloader.check_yt_dlp_installed", return_value=True)
+        real_popen = subprocess.Popen
+        mocker.patch(
+            "src.downloader.subprocess.Popen",
+            side_effect=lambda cmd, **kwargs: real_popen(["true"] if cmd[0] == "yt-dlp" else ["cat"], **kwargs)
+        )
+
+        result = stream_audio("test")
+
+        assert result.success is False
+        assert "no audio" in result.error
+
+    def test_download_error_reported(self, mocker):
+        mocker.patch("src.downloader.check_yt_dlp_installed", return_value=True)
+        real_popen = subprocess.Popen
+
+        def fake_popen(cmd, **kwargs):
+            if cmd[0] == "yt-dlp":
+                cmd = [sys.executable, "-c", "import sys; sys.stderr.write('x' * 200000 + 'video unavailable'); sys.exit(1)"]
+            else:
+                cmd = ["cat"]
+            return real_popen(cmd, **kwargs)
+
+        mocker.patch("src.downloader.subprocess.Popen", side_effect=fake_popen)
+
+        result = stream_audio("test")
+
+        assert result.success is False
+        assert result.error.endswith("video unavailable")
+
+    def test_import_does_not_load_numpy(self):
+        code = "import sys, src.downloader; print('numpy' in sys.modules)"
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent
+        )
+        assert out.stdout.strip() == "False"
+
+
+class TestCleanupDownloads:
+    """Tests for cleanup_downloads function."""
+
+    def test_removes_only_audio_files(self, tmp_path):
+        for name in ["a.wav", "b.mp3", "c.m4a", "d.webm", "e.opus", "notes.txt"]:
+            (tmp_path / name).write_bytes(b"data")
+        (tmp_path / "sub.wav").mkdir()
+
+        removed = cleanup_downloads(tmp_path)
+
+        assert removed == 5
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["notes.txt", "sub.wav"]
+
+    def test_missing_directory(self, tmp_path):
+        assert cleanup_downloads(tmp_path / "missing") == 0
+
+    def test_file_instead_of_directory(self, tmp_path):
+        audio = tmp_path / "a.wav"
+        audio.write_bytes(b"data")
+
+        assert cleanup_downloads(audio) == 0
+        assert audio.exists()
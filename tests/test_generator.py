@@ -1,5 +1,7 @@
 """Tests for MIDI generator module."""
 
+import random
+
 import pytest
 from pathlib import Path
 
@@ -8,8 +10,12 @@ from src.generator import (
     get_scale_notes,
     get_chord_notes,
     generate_relaxation_midi,
+    generate_relaxation_midi_bytes,
     generate_from_analysis,
+    generate_from_analysis_bytes,
+    generate_variations,
     NOTE_MAP,
+    PROGRESSIONS,
     SCALES,
 )
 
@@ -26,8 +32,18 @@ class TestNoteMapping:
         assert NOTE_MAP["C"] == 60
 
     def test_scale_intervals(self):
-        assert SCALES["major"] == [0, 2, 4, 5, 7, 9, 11]
-        assert SCALES["minor"] == [0, 2, 3, 5, 7, 8, 10]
+        assert SCALES["major"] == (0, 2, 4, 5, 7, 9, 11)
+        assert SCALES["minor"] == (0, 2, 3, 5, 7, 8, 10)
+
+    def test_lookup_tables_are_read_only(self):
+        with pytest.raises(TypeError):
+            NOTE_MAP["H"] = 71
+        with pytest.raises(TypeError):
+            SCALES["custom"] = [0]
+        with pytest.raises(AttributeError):
+            SCALES["major"].append(99)
+        with pytest.raises(AttributeError):
+            PROGRESSIONS["major"][0].append(1)
 
 
 class TestGetScaleNotes:
@@ -129,6 +145,41 @@ class TestGenerateRelaxationMidi:
         # Note: Very short durations might coincidentally match
         assert path1.read_bytes() != path2.read_bytes()
 
+    def test_melody_without_chord_track(self, tmp_path):
+        """Melody still uses chord tones when the chord track is disabled."""
+        output_path = tmp_path / "no_chords.mid"
+
+        params = GenerationParams(duration_seconds=20, add_chords=False)
+
+        generate_relaxation_midi(params, output_path, seed=3)
+
+        assert output_path.exists()
+
+
+class TestGenerateRelaxationMidiBytes:
+    """Tests for in-memory MIDI generation."""
+
+    def test_returns_midi_bytes(self):
+        data = generate_relaxation_midi_bytes(GenerationParams(duration_seconds=10))
+        assert data.startswith(b"MThd")
+
+    def test_matches_file_output(self, tmp_path):
+        params = GenerationParams(duration_seconds=10)
+        output_path = tmp_path / "test.mid"
+
+        data = generate_relaxation_midi_bytes(params, seed=5)
+        generate_relaxation_midi(params, output_path, seed=5)
+
+        assert output_path.read_bytes() == data
+
+    def test_seed_leaves_global_random_state_alone(self):
+        random.seed(11)
+        state = random.getstate()
+
+        generate_relaxation_midi_bytes(GenerationParams(duration_seconds=10), seed=5)
+
+        assert random.getstate() == state
+
 
 class TestGenerateFromAnalysis:
     """Tests for generate_from_analysis function."""
@@ -170,3 +221,81 @@ class TestGenerateFromAnalysis:
 
         # File should exist (exact duration verification would need MIDI parsing)
         assert Path(output_path).exists()
+
+    def test_reproducible_with_seed(self, tmp_path):
+        analysis_params = {"tempo": 70, "root_note": "D", "mode": "minor"}
+        path1 = tmp_path / "a.mid"
+        path2 = tmp_path / "b.mid"
+
+        generate_from_analysis(analysis_params, path1, duration_override=10, seed=9)
+        generate_from_analysis(analysis_params, path2, duration_override=10, seed=9)
+
+        assert path1.read_bytes() == path2.read_bytes()
+
+    def test_bytes_match_file(self, tmp_path):
+        analysis_params = {"tempo": 90, "root_note": "E", "mode": "major", "is_calm": True}
+        output_path = tmp_path / "e.mid"
+
+        generate_from_analysis(analysis_params, output_path, duration_override=10, seed=4)
+        data = generate_from_analysis_bytes(analysis_params, duration_override=10, seed=4)
+
+        assert data == output_path.read_bytes()
+
+
+class TestGenerateVariations:
+    """Tests for generate_variations function."""
+
+    def test_generates_requested_count(self, tmp_path):
+        params = GenerationParams(duration_seconds=10)
+
+        paths = generate_variations(params, tmp_path, num_variations=2)
+
+        assert len(paths) == 2
+        for path in paths:
+            assert Path(path).exists()
+
+    def test_small_batch_renders_in_process(self, tmp_path, mocker):
+        pool = mocker.patch("src.generator.ProcessPoolExecutor")
+
+        paths = generate_variations(GenerationParams(duration_seconds=10), tmp_path, num_variations=3)
+
+        pool.assert_not_called()
+        assert len(paths) == 3
+
+    def test_parallel_matches_in_process(self, tmp_path):
+        """Worker processes produce the same files as in-process generation."""
+        params = GenerationParams(duration_seconds=10)
+
+        random.seed(7)
+        parallel = generate_variations(
+            params, tmp_path / "parallel", num_variations=3, max_workers=2
+        )
+        random.seed(7)
+        serial = generate_variations(
+            params, tmp_path / "serial", num_variations=3, max_workers=1
+        )
+
+        for a, b in zip(parallel, serial):
+            assert Path(a).read_bytes() == Path(b).read_bytes()
+
+    def test_preserves_base_params(self, tmp_path, mocker):
+        """Varied params keep fields that are not varied."""
+        spy = mocker.patch(
+            "src.generator.generate_relaxation_midi",
+            side_effect=lambda params, output_path, seed=None: str(output_path)
+        )
+        params = GenerationParams(
+            duration_seconds=10,
+            add_bass=False,
+            melody_octave=6,
+            time_signature=(3, 4)
+        )
+
+        generate_variations(params, tmp_path, num_variations=2, max_workers=1)
+
+        for call in spy.call_args_list:
+            varied = call.args[0]
+            assert varied is not params
+            assert varied.add_bass is False
+            assert varied.melody_octave == 6
+            assert varied.time_signature == (3, 4)
@@ -1,15 +1,71 @@
 """Tests for the main pipeline module."""
 
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
 from pathlib import Path
 
 from src.pipeline import (
     PipelineResult,
+    _log_level,
+    _run_generation_job,
+    run_batch,
     run_pipeline,
 )
+from src.downloader import DownloadResult, StreamResult
 from src.youtube_search import VideoResult
 
 
+def make_video(video_id: str) -> VideoResult:
+    return VideoResult(
+        video_id=video_id,
+        title=f"Video {video_id}",
+        channel="Channel",
+        duration_seconds=300,
+        view_count=1000,
+        url=f"https://youtube.com/watch?v={video_id}"
+    )
+
+
+def fake_download(url, output_dir, max_duration_seconds=600):
+    """Stand-in for download_audio that writes a placeholder file."""
+    video_id = url.rsplit("=", 1)[-1]
+    if video_id == "bad":
+        return DownloadResult(success=False, error="unavailable")
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    file_path = Path(output_dir) / f"{video_id}.wav"
+    file_path.write_bytes(b"RIFF")
+    return DownloadResult(success=True, file_path=str(file_path))
+
+
+def marking_generation_job(job):
+    """Generation job that leaves a marker once rendering is done (runs in a worker)."""
+    result = _run_generation_job(job)
+    Path(job.output_path).with_suffix(".rendered").touch()
+    return result
+
+
+def crashing_generation_job(job):
+    """Generation job whose worker process dies outright."""
+    os._exit(1)
+
+
+ANALYSIS = {
+    "tempo": 70,
+    "root_note": "A",
+    "mode": "minor",
+    "is_calm": True,
+    "suggested_duration": 60
+}
+
+
 class TestPipelineResult:
     """Tests for PipelineResult dataclass."""
 
@@ -67,6 +123,69 @@ class TestPipelineResult:
         result.save(output_file)
 
         assert output_file.exists()
+        assert json.loads(output_file.read_text()) == result.to_dict()
+        assert not (tmp_path / "analysis_summary.json").exists()
+
+    def test_save_writes_analysis_summary(self, tmp_path):
+        result = PipelineResult(
+            success=True,
+            search_results=[],
+            downloaded_files=[],
+            analyses=[{"tempo": 70, "root_note": "A"}],
+            generated_files=[],
+            errors=[],
+            timestamp="2026-02-23T12:00:00"
+        )
+
+        result.save(tmp_path / "pipeline_result.json")
+
+        summary = json.loads((tmp_path / "analysis_summary.json").read_bytes())
+        assert summary == result.analyses
+
+    def test_to_json_bytes_without_orjson(self, mocker):
+        """Falls back to the stdlib encoder when orjson is missing."""
+        mocker.patch("src.pipeline.orjson", None)
+        result = PipelineResult(
+            success=False,
+            search_results=[],
+            downloaded_files=[],
+            analyses=[{"tempo": 70}],
+            generated_files=[],
+            errors=["Search failed"],
+            timestamp="2026-02-23T12:00:00"
+        )
+
+        data = json.loads(result.to_json_bytes())
+
+        assert data == result.to_dict()
+
+
+class TestLazyImports:
+    """Tests for the lazily imported pipeline re-exports."""
+
+    def test_import_skips_heavy_modules(self):
+        code = (
+            "import sys, src.pipeline; "
+            "print(any(m in sys.modules for m in ('src.analyzer', 'src.downloader', 'numpy')))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent
+        )
+        assert out.stdout.strip() == "False"
+
+    def test_reexports_resolve(self):
+        import src.analyzer
+        import src.pipeline
+
+        assert src.pipeline.analyze_audio is src.analyzer.analyze_audio
+
+    def test_unknown_attribute(self):
+        import src.pipeline
+
+        with pytest.raises(AttributeError):
+            src.pipeline.not_a_real_name
 
 
 class TestRunPipeline:
@@ -85,10 +204,43 @@ class TestRunPipeline:
 
         assert isinstance(result, PipelineResult)
         assert result.timestamp
+        assert result.elapsed_seconds >= 0
 
         # Should generate at least something
         # (may have errors if network unavailable)
 
+    def test_small_run_renders_in_process(self, tmp_path, mocker):
+        mocker.patch("src.pipeline.search_relaxation_music", return_value=[make_video("a")])
+        pool = mocker.patch("src.pipeline.ProcessPoolExecutor")
+
+        result = run_pipeline(
+            output_dir=tmp_path,
+            download_audio_files=False,
+            generate_variations=3,
+            duration_seconds=10
+        )
+
+        pool.assert_not_called()
+        assert len(result.generated_files) == 3
+
+    def test_crashed_worker_becomes_errors(self, tmp_path, mocker):
+        mocker.patch(
+            "src.pipeline.search_relaxation_music",
+            return_value=[make_video("a"), make_video("b")]
+        )
+        mocker.patch("src.pipeline._run_generation_job", crashing_generation_job)
+
+        result = run_pipeline(
+            output_dir=tmp_path,
+            download_audio_files=False,
+            duration_seconds=5,
+            generation_workers=2
+        )
+
+        assert result.generated_files == []
+        assert len(result.errors) == 2
+        assert all(e.startswith("Generation failed") for e in result.errors)
+
     def test_pipeline_creates_output_dir(self, tmp_path):
         """Test that pipeline creates output directory."""
         output_dir = tmp_path / "new_output"
@@ -123,6 +275,269 @@ class TestRunPipeline:
             assert len(result.generated_files) > 0
 
 
+class TestRunPipelineDownload:
+    """Tests for the download/analyze/generate path with mocked I/O."""
+
+    @pytest.fixture
+    def mock_io(self, mocker):
+        mocker.patch(
+            "src.pipeline.search_relaxation_music",
+            return_value=[make_video("a"), make_video("bad"), make_video("c")]
+        )
+        mocker.patch("src.downloader.download_audio", side_effect=fake_download)
+        mocker.patch("src.analyzer.analyze_audio", return_value=object())
+        mocker.patch(
+            "src.analyzer.analyze_for_generation",
+            side_effect=lambda features: dict(ANALYSIS)
+        )
+        # The real warm-up would call the mocked analyzer from a background
+        # thread; TestWarmUpAnalyzer covers it on its own
+        mocker.patch("src.pipeline._warm_up_analyzer")
+
+    def test_results_follow_search_order(self, tmp_path, mock_io):
+        result = run_pipeline(
+            output_dir=tmp_path,
+            generate_variations=2,
+            duration_seconds=5,
+            cleanup_after=False,
+            cache_dir=None,
+            generation_workers=2
+        )
+
+        assert result.success is True
+        assert [Path(p).name for p in result.downloaded_files] == ["a.wav", "c.wav"]
+        assert [a["source_video"] for a in result.analyses] == ["Video a", "Video c"]
+        assert [Path(p).name for p in result.generated_files] == [
+            "generated_1_v1.mid", "generated_1_v2.mid",
+            "generated_3_v1.mid", "generated_3_v2.mid",
+        ]
+        assert len(result.errors) == 1
+        assert "Video bad" in result.errors[0]
+
+        # The summary is only written when the result is saved
+        assert not (tmp_path / "analysis_summary.json").exists()
+
+        # Variations rendered in worker processes must still differ
+        v1, v2 = result.generated_files[:2]
+        assert Path(v1).read_bytes() != Path(v2).read_bytes()
+
+    def test_cleanup_removes_downloads(self, tmp_path, mock_io):
+        result = run_pipeline(
+            output_dir=tmp_path,
+            duration_seconds=5,
+            cleanup_after=True,
+            cache_dir=None
+        )
+
+        assert result.downloaded_files
+        for path in result.downloaded_files:
+            assert not Path(path).exists()
+        # The per-run temp directory goes too
+        assert not Path(result.downloaded_files[0]).parent.parent.exists()
+
+    def test_each_download_removed_after_analysis(self, tmp_path, mock_io, mocker):
+        """A video's audio is gone before later analyses run."""
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+        seen = []
+
+        def record_files(features):
+            seen.append(sorted(p.name for p in download_dir.glob("video_*/*.wav")))
+            return dict(ANALYSIS)
+
+        mocker.patch("src.pipeline.tempfile.mkdtemp", return_value=str(download_dir))
+        mocker.patch("src.analyzer.analyze_for_generation", side_effect=record_files)
+        mocker.patch("src.pipeline.MAX_DOWNLOAD_WORKERS", 1)
+
+        run_pipeline(output_dir=tmp_path / "out", duration_seconds=5, cache_dir=None)
+
+        assert seen == [["a.wav"], ["c.wav"]]
+
+    def test_analysis_uses_feature_cache(self, tmp_path, mock_io, mocker):
+        cached = mocker.patch("src.analyzer.analyze_audio_cached", return_value=object())
+        cache_dir = tmp_path / "cache"
+
+        result = run_pipeline(
+            output_dir=tmp_path / "out",
+            duration_seconds=5,
+            cache_dir=cache_dir
+        )
+
+        assert len(result.analyses) == 2
+        assert cached.call_count == 2
+        assert all(call.args[1] == cache_dir for call in cached.call_args_list)
+
+    def test_generation_overlaps_downloads(self, tmp_path, mock_io, mocker):
+        """Early videos are generated while later ones are still downloading."""
+        first_midi = tmp_path / "generated_1_v1.rendered"
+        seen_first = []
+
+        def slow_download(url, output_dir, max_duration_seconds=600):
+            if url.endswith("c"):
+                deadline = time.monotonic() + 10
+                while not first_midi.exists() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                seen_first.append(first_midi.exists())
+            return fake_download(url, output_dir, max_duration_seconds)
+
+        mocker.patch("src.downloader.download_audio", side_effect=slow_download)
+        mocker.patch("src.pipeline._run_generation_job", marking_generation_job)
+
+        result = run_pipeline(output_dir=tmp_path, duration_seconds=5, cache_dir=None)
+
+        assert seen_first == [True]
+        assert len(result.generated_files) == 2
+
+    def test_crashed_worker_keeps_results_and_cleans_up(self, tmp_path, mock_io, mocker):
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+        mocker.patch("src.pipeline.tempfile.mkdtemp", return_value=str(download_dir))
+        mocker.patch("src.pipeline._run_generation_job", crashing_generation_job)
+
+        result = run_pipeline(
+            output_dir=tmp_path / "out",
+            duration_seconds=5,
+            cache_dir=None,
+            generation_workers=2
+        )
+
+        assert [a["source_video"] for a in result.analyses] == ["Video a", "Video c"]
+        assert len(result.downloaded_files) == 2
+        assert result.generated_files == []
+        assert sum(e.startswith("Generation failed") for e in result.errors) == 2
+        assert not download_dir.exists()
+
+    def test_write_failure_is_reported(self, tmp_path, mock_io):
+        (tmp_path / "generated_1_v1.mid").mkdir()
+
+        result = run_pipeline(output_dir=tmp_path, duration_seconds=5, cache_dir=None)
+
+        assert [Path(p).name for p in result.generated_files] == ["generated_3_v1.mid"]
+        assert any("Generation failed for Video a" in e for e in result.errors)
+
+    def test_search_respects_download_cap(self, tmp_path, mock_io, mocker):
+        search = mocker.patch("src.pipeline.search_relaxation_music", return_value=[])
+
+        run_pipeline(output_dir=tmp_path, duration_seconds=5)
+        run_pipeline(output_dir=tmp_path, duration_seconds=5, download_audio_files=False)
+
+        assert search.call_args_list[0].kwargs["max_duration_minutes"] == 10
+        assert search.call_args_list[1].kwargs["max_duration_minutes"] == 15
+
+    def test_warms_up_analyzer(self, tmp_path, mock_io, mocker):
+        warm_up = mocker.patch("src.pipeline._warm_up_analyzer")
+
+        run_pipeline(output_dir=tmp_path, duration_seconds=5, cache_dir=None)
+
+        warm_up.assert_called_once()
+
+    def test_no_warm_up_without_search_results(self, tmp_path, mocker):
+        mocker.patch("src.pipeline.search_relaxation_music", return_value=[])
+        warm_up = mocker.patch("src.pipeline._warm_up_analyzer")
+
+        run_pipeline(output_dir=tmp_path, duration_seconds=5)
+
+        warm_up.assert_not_called()
+
+    def test_stream_mode_skips_disk(self, tmp_path, mock_io, mocker):
+        download = mocker.patch("src.downloader.download_audio")
+        mocker.patch(
+            "src.downloader.stream_audio",
+            side_effect=lambda url, max_duration_seconds: StreamResult(
+                success=not url.endswith("bad"),
+                samples=np.zeros(4, dtype=np.float32),
+                sample_rate=22050,
+                error="unavailable"
+            )
+        )
+        analyze = mocker.patch("src.analyzer.analyze_signal", return_value=object())
+
+        result = run_pipeline(output_dir=tmp_path, duration_seconds=5, stream_mode=True)
+
+        download.assert_not_called()
+        assert analyze.call_count == 2
+        assert result.downloaded_files == []
+        assert [a["source_video"] for a in result.analyses] == ["Video a", "Video c"]
+        assert len(result.errors) == 1
+
+
+class TestWarmUpAnalyzer:
+    """Tests for the analyzer warm-up helper."""
+
+    def test_runs_once_and_swallows_errors(self, mocker):
+        from src.pipeline import _warm_up_analyzer
+
+        analyze = mocker.patch("src.analyzer.analyze_signal", side_effect=ImportError("no librosa"))
+        _warm_up_analyzer.cache_clear()
+        try:
+            _warm_up_analyzer()
+            _warm_up_analyzer()
+        finally:
+            _warm_up_analyzer.cache_clear()
+
+        analyze.assert_called_once()
+
+
+class TestRunBatch:
+    """Tests for run_batch function."""
+
+    def test_runs_each_config_in_own_dir(self, tmp_path, mocker):
+        mocker.patch(
+            "src.pipeline.search_relaxation_music",
+            return_value=[]
+        )
+
+        results = run_batch(
+            [
+                {"download_audio_files": False, "duration_seconds": 5},
+                {"download_audio_files": False, "duration_seconds": 10},
+            ],
+            output_dir=tmp_path,
+            max_workers=2
+        )
+
+        assert len(results) == 2
+        assert all(isinstance(r, PipelineResult) for r in results)
+        assert (tmp_path / "run_1").exists()
+        assert (tmp_path / "run_2").exists()
+
+    def test_explicit_output_dir_wins(self, tmp_path, mocker):
+        mocker.patch(
+            "src.pipeline.search_relaxation_music",
+            return_value=[]
+        )
+        custom_dir = tmp_path / "custom"
+
+        run_batch(
+            [{"output_dir": custom_dir, "download_audio_files": False, "duration_seconds": 5}],
+            output_dir=tmp_path,
+            max_workers=1
+        )
+
+        assert custom_dir.exists()
+        assert not (tmp_path / "run_1").exists()
+
+    def test_runs_render_in_process(self, tmp_path, mocker):
+        entry = mocker.patch("src.pipeline._run_batch_entry")
+        mocker.patch("src.pipeline.ProcessPoolExecutor", ThreadPoolExecutor)
+
+        run_batch([{"duration_seconds": 5}, {"generation_workers": 4}], output_dir=tmp_path)
+
+        assert [call.args[0]["generation_workers"] for call in entry.call_args_list] == [1, 4]
+
+
+class TestLogLevel:
+    """Tests for LOG_LEVEL parsing."""
+
+    def test_known_names(self):
+        assert _log_level("debug") == logging.DEBUG
+        assert _log_level("WARNING") == logging.WARNING
+
+    def test_unknown_name(self):
+        assert _log_level("verbose") is None
+        assert _log_level("") is None
+
+
 class TestPipelineIntegration:
     """Integration tests for the full pipeline."""
 